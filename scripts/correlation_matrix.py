@@ -2,6 +2,11 @@ import pandas as pd
 import numpy as np
 import seaborn as sns
 import matplotlib.pyplot as plt
+from typing import Union
+try:
+    from .sampling import ReservoirSampler, apply_sample
+except ImportError:
+    from sampling import ReservoirSampler, apply_sample
 
 def drop_unnecessary_columns(df: pd.DataFrame, columns_to_drop: list) -> pd.DataFrame:
     """Drop specified columns from the DataFrame.
@@ -29,18 +34,21 @@ def move_column_to_first(df: pd.DataFrame, column_name: str) -> pd.DataFrame:
     columns.insert(0, columns.pop(columns.index(column_name)))
     return df.reindex(columns=columns)
 
-def plot_correlation_matrix(df: pd.DataFrame, figsize: tuple=(10, 10), cmap: str='coolwarm') -> pd.DataFrame:
+def plot_correlation_matrix(df: pd.DataFrame, figsize: tuple=(10, 10), cmap: str='coolwarm',
+                            sample: Union[None, int, ReservoirSampler]=None) -> pd.DataFrame:
     """Plot the correlation matrix of the DataFrame.
     
     Args:
         df: The DataFrame for which the correlation matrix is computed.
         figsize: The figure size of the plot.
         cmap: The colormap of the heatmap.
+        sample: Rows to correlate; see sampling.apply_sample. Defaults to all rows. A stratified
+            sampler needs its strata column in df; the column is dropped before correlating.
 
     Returns:
         The DataFrame with the correlation matrix.
     """
-    corr_matrix = df.corr()
+    corr_matrix = apply_sample(df, sample, drop_strata=True).corr()
     plt.figure(figsize=figsize)
     sns.heatmap(corr_matrix, annot=False, fmt=".2f", cmap=cmap)
     plt.title("Correlation Matrix of Walkability Index")
@@ -1,25 +1,32 @@
-from typing import Tuple, List
+from typing import Tuple, List, Optional, Union
 import numpy as np
 import pandas as pd
 from sklearn.preprocessing import normalize
 from sklearn.decomposition import PCA
 import matplotlib.pyplot as plt
 import seaborn as sns
+try:
+    from .sampling import ReservoirSampler, apply_sample
+except ImportError:
+    from sampling import ReservoirSampler, apply_sample
 
 
-def normalize_data(data: pd.DataFrame) -> np.ndarray:
+def normalize_data(data: pd.DataFrame, sample: Union[None, int, ReservoirSampler] = None) -> np.ndarray:
     """
     Normalize the input numerical data using max normalization.
 
     Args:
     - data (pd.DataFrame): The numerical data to be normalized.
+    - sample (None, int or ReservoirSampler): Rows to keep after dropping missing values; see sampling.apply_sample.
+      Use this for stratified or weighted samples, whose strata column is dropped after sampling.
 
     Returns:
     - np.ndarray: The normalized numerical data as a Numpy array.
     """
     assert isinstance(data, pd.DataFrame), "Input data must be a pandas DataFrame."
     
-    normalized_data = normalize(data.dropna().values, axis=0, norm='max')
+    data = apply_sample(data.dropna(), sample, drop_strata=True)
+    normalized_data = normalize(data.values, axis=0, norm='max')
     return normalized_data
 
 def perform_pca(data: np.ndarray, n_components: int = 20) -> PCA:
@@ -95,17 +102,20 @@ def plot_stacked_bar(normalized_components_dict):
 
     plt.show()
 
-def pca_plot_scatter(numerical_matrix_normalized):
+def pca_plot_scatter(numerical_matrix_normalized, sample: Optional[int] = None):
     """
     Perform PCA on normalized numerical data and plot a scatter plot of the top 2 principal components using Seaborn.
 
     Args:
         numerical_matrix_normalized (array-like): The normalized numerical data matrix.
-        num_comp_selected (int): The number of principal components to retain.
+        sample (None or int): Number of uniformly sampled rows to fit and plot; see sampling.apply_sample.
+            Defaults to all rows. For stratified or weighted samples use normalize_data(..., sample=...).
 
     Returns:
         None
     """
+    numerical_matrix_normalized = apply_sample(numerical_matrix_normalized, sample)
+
     pca_selected = PCA(n_components=2)
     pca_selected.fit(numerical_matrix_normalized)
 
@@ -116,6 +126,7 @@ def pca_plot_scatter(numerical_matrix_normalized):
     sns.scatterplot(data=df_transformed, x='Principal Component 1', y='Principal Component 2', alpha=0.3, edgecolor=None)
     plt.xlabel('Principal Component 1')
     plt.ylabel('Principal Component 2')
-    plt.title('Matching 5000 Data Points Sample to the Top 2 PCA Components')
+    sample_label = ' Sample' if sample is not None else ''
+    plt.title(f'Matching {len(df_transformed)} Data Points{sample_label} to the Top 2 PCA Components')
     plt.gca().set_aspect('equal', adjustable='box')
     plt.show()
\ No newline at end of file
@@ -1,8 +1,14 @@
 from pandas import DataFrame
 from sklearn.model_selection import train_test_split
 import numpy as np
-
-def prepare_data_for_regression(df: DataFrame, target_column: str, features_not_include: list) -> tuple:
+from typing import Union
+try:
+    from .sampling import ReservoirSampler, apply_sample
+except ImportError:
+    from sampling import ReservoirSampler, apply_sample
+
+def prepare_data_for_regression(df: DataFrame, target_column: str, features_not_include: list,
+                                sample: Union[None, int, ReservoirSampler] = None) -> tuple:
     """
     Cleans the DataFrame, selects features for regression, and splits it into features and target datasets.
 
@@ -10,6 +16,8 @@ def prepare_data_for_regression(df: DataFrame, target_column: str, features_not_
     - df (DataFrame): The input DataFrame to be processed.
     - target_column (str): The name of the column to be used as the target variable.
     - features_not_include (list): A list of column names to exclude from the feature set.
+    - sample (None, int or ReservoirSampler): Rows to keep after cleaning; see sampling.apply_sample. Defaults to all rows.
+      A stratified sampler's strata column is dropped after sampling.
 
     Returns:
     - tuple: A tuple containing the features DataFrame `X`, the target Series `y`, the feature names list, and `df_cleaned`
@@ -18,6 +26,9 @@ def prepare_data_for_regression(df: DataFrame, target_column: str, features_not_
     df_cleaned = df[~df.isin([-99999]).any(axis=1)]
     df_cleaned.dropna(inplace=True)
 
+    # Sample the clean rows so the sample has the requested size
+    df_cleaned = apply_sample(df_cleaned, sample, drop_strata=True)
+
     # Select features
     feature_list = [x for x in df_cleaned.columns if x not in features_not_include]
 
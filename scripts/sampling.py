@@ -0,0 +1,192 @@
+from numbers import Integral
+from typing import Iterable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+
+class ReservoirSampler:
+    """
+    One-pass reservoir sampler over a stream of DataFrame chunks.
+
+    Every row gets a random key and the rows with the smallest keys are kept, so
+    memory is bounded by the sample size and the result does not depend on how
+    the stream was chunked. Three designs are supported:
+
+    - uniform: every row is equally likely (keys are Uniform(0, 1)).
+    - weighted: rows are drawn with probability proportional to weight_column,
+      e.g. 'TotPop' (Efraimidis-Spirakis keys, Exponential(weight)); rows with a
+      non-positive or missing weight are never drawn.
+    - stratified: a separate reservoir of n rows is kept for each value of
+      strata_column, e.g. 'CBSA' or 'STATEFP', so small strata are not drowned
+      out by large ones. Small strata are over-represented relative to the full
+      table; use a uniform sample when population-level proportions matter.
+    """
+
+    def __init__(self, n: int, strata_column: Optional[str] = None, weight_column: Optional[str] = None,
+                 seed: Optional[int] = None):
+        """
+        Args:
+        - n (int): Sample size, or sample size per stratum when strata_column is given.
+        - strata_column (str, optional): Column whose values define the strata.
+        - weight_column (str, optional): Column holding the non-negative sampling weights.
+        - seed (int, optional): Seed for reproducible samples.
+        """
+        assert isinstance(n, Integral) and not isinstance(n, bool) and n > 0, "n must be a positive integer"
+        self.n = int(n)
+        self.strata_column = strata_column
+        self.weight_column = weight_column
+        self.seed = seed
+        self._rng = np.random.default_rng(seed)
+        self._reservoir: Optional[pd.DataFrame] = None
+        self._keys = np.empty(0)
+
+    def _draw_keys(self, chunk: pd.DataFrame) -> np.ndarray:
+        uniforms = self._rng.random(len(chunk))
+        if self.weight_column is None:
+            return uniforms
+        weights = chunk[self.weight_column].to_numpy(dtype=float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            keys = -np.log(uniforms) / weights
+        keys[~(weights > 0)] = np.inf
+        return keys
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """
+        Offer one chunk of rows to the reservoir.
+
+        Args:
+        - chunk (pd.DataFrame): A chunk of the table, e.g. from pd.read_csv(..., chunksize=...).
+        """
+        assert isinstance(chunk, pd.DataFrame), "chunk must be a pandas DataFrame"
+        for column in (self.strata_column, self.weight_column):
+            assert column is None or column in chunk.columns, f"{column} must be a column in the chunk"
+
+        keys = self._draw_keys(chunk)
+        candidates = np.isfinite(keys)
+        if self.strata_column is None and len(self._keys) == self.n:
+            # Only rows that beat the current worst key can enter a full reservoir.
+            candidates &= keys < self._keys.max()
+        if not candidates.any():
+            return
+
+        if self._reservoir is None:
+            combined, combined_keys = chunk[candidates], keys[candidates]
+        else:
+            combined = pd.concat([self._reservoir, chunk[candidates]])
+            combined_keys = np.concatenate([self._keys, keys[candidates]])
+
+        if self.strata_column is None:
+            keep = np.argsort(combined_keys, kind="stable")[:self.n]
+        else:
+            ranks = pd.Series(combined_keys).groupby(combined[self.strata_column].to_numpy(), dropna=False)
+            keep = np.flatnonzero(ranks.rank(method="first").to_numpy() <= self.n)
+
+        self._reservoir = combined.iloc[keep]
+        self._keys = combined_keys[keep]
+
+    def sample(self) -> pd.DataFrame:
+        """
+        Return the rows drawn so far, in their original stream order.
+
+        Returns:
+        - pd.DataFrame: The sampled rows, with the index they had in the stream.
+        """
+        if self._reservoir is None:
+            return pd.DataFrame()
+        return self._reservoir.sort_index(kind="stable")
+
+
+def reservoir_sample(chunks: Iterable[pd.DataFrame], n: int, **kwargs) -> pd.DataFrame:
+    """
+    Draw a reservoir sample in a single pass over an iterable of DataFrame chunks.
+
+    Args:
+    - chunks (Iterable[pd.DataFrame]): The chunks to sample from.
+    - n (int): Sample size, or sample size per stratum.
+    - **kwargs: Passed on to ReservoirSampler (strata_column, weight_column, seed).
+
+    Returns:
+    - pd.DataFrame: The sampled rows.
+    """
+    sampler = ReservoirSampler(n, **kwargs)
+    for chunk in chunks:
+        sampler.update(chunk)
+    return sampler.sample()
+
+
+def sample_csv(file_path: str, n: int, chunksize: int = 100_000, **kwargs) -> pd.DataFrame:
+    """
+    Draw a reservoir sample from a CSV file without loading it into memory.
+
+    Args:
+    - file_path (str): The path to the CSV file, e.g. walkability_dataset.csv.
+    - n (int): Sample size, or sample size per stratum.
+    - chunksize (int): Number of rows read per chunk.
+    - **kwargs: Passed on to ReservoirSampler (strata_column, weight_column, seed).
+
+    Returns:
+    - pd.DataFrame: The sampled rows.
+    """
+    assert isinstance(file_path, str), "file_path must be a string"
+    assert isinstance(chunksize, int) and chunksize > 0, "chunksize must be a positive integer"
+    with pd.read_csv(file_path, chunksize=chunksize) as reader:
+        return reservoir_sample(reader, n, **kwargs)
+
+
+def apply_sample(data: Union[pd.DataFrame, np.ndarray], sample: Union[None, int, ReservoirSampler], seed: int = 42,
+                 drop_strata: bool = False):
+    """
+    Resolve the opt-in `sample=` parameter of the plotting and regression helpers.
+
+    A ReservoirSampler passed here only describes the design and must not have
+    been fed any chunks; a new reservoir is drawn on every call, so the same
+    unused sampler can be reused across helpers. To sample a chunked stream,
+    call sample_csv() or reservoir_sample() and pass the result as data instead.
+
+    Args:
+    - data (pd.DataFrame or np.ndarray): The full data; arrays are sampled by row.
+    - sample (None, int or ReservoirSampler): None keeps all rows, an int draws that many rows
+      uniformly, and an unused ReservoirSampler draws its (stratified or weighted) design.
+    - seed (int): Seed used when sample is an int.
+    - drop_strata (bool): Drop the sampler's strata column from the result, e.g. before computing correlations.
+
+    Returns:
+    - The sampled rows, of the same type as data.
+    """
+    if sample is None:
+        return data
+    if isinstance(sample, Integral) and not isinstance(sample, bool):
+        sample = ReservoirSampler(int(sample), seed=seed)
+    assert isinstance(sample, ReservoirSampler), "sample must be None, an int or a ReservoirSampler"
+    assert sample._reservoir is None, \
+        "sample must be an unused ReservoirSampler; pass sampler.sample() as data to use a drawn reservoir."
+    sampler = ReservoirSampler(sample.n, strata_column=sample.strata_column, weight_column=sample.weight_column,
+                               seed=sample.seed)
+
+    if isinstance(data, np.ndarray):
+        assert sampler.strata_column is None and sampler.weight_column is None, \
+            "Stratified and weighted samples need a DataFrame with the strata/weight columns; sample it first."
+        sampler.update(pd.DataFrame({"row": np.arange(len(data))}))
+        return data[sampler.sample()["row"].to_numpy()]
+
+    assert isinstance(data, pd.DataFrame), "data must be a pandas DataFrame or a numpy array"
+    sampler.update(data)
+    sampled = sampler.sample()
+    if drop_strata and sampler.strata_column is not None:
+        sampled = sampled.drop(columns=[sampler.strata_column])
+    return sampled
+
+# For walkability_dataset.csv
+# Draw the sample once from the file, then run the usual helpers on it without sample=:
+# walkability_sample = sample_csv("walkability_dataset.csv", 5000, seed=42)
+# walkability_by_cbsa = sample_csv("walkability_dataset.csv", 20, strata_column="CBSA", seed=42)
+# walkability_by_pop = sample_csv("walkability_dataset.csv", 5000, weight_column="TotPop", seed=42)
+# walkability_df_numeric_data = drop_unnecessary_columns(walkability_by_cbsa, columns_to_drop)
+# corr_matrix = plot_correlation_matrix(walkability_df_numeric_data)
+#
+# Or sample a DataFrame that is already loaded; the strata column is dropped after sampling:
+# cbsa_sampler = ReservoirSampler(20, strata_column="CBSA", seed=42)
+# walkability_df_numeric_data = drop_unnecessary_columns(walkability_df, [c for c in columns_to_drop if c != "CBSA"])
+# corr_matrix = plot_correlation_matrix(walkability_df_numeric_data, sample=cbsa_sampler)
+# pca_plot_scatter(normalize_data(walkability_df_numeric_data, sample=cbsa_sampler))